@@ -6,12 +6,19 @@ Command-line interface for DictWhisperer.
 import argparse
 import sys
 import os
-import time
-from .dictwhisperer import (
-    DictationSession,
+# Only the lightweight defaults are imported here so --help and argument
+# errors don't pay for loading numpy, PortAudio and the Whisper backend.
+from .constants import (
     DEFAULT_VAULT_PATH,
     DEFAULT_MODEL_SIZE,
     DEFAULT_CHUNK_DURATION,
+    DEFAULT_STREAMING_STEP,
+    DEFAULT_BACKEND,
+    DEFAULT_LANGUAGE,
+    DEFAULT_DEVICE,
+    DEFAULT_VAD_AGGRESSIVENESS,
+    BACKENDS,
+    DEVICES,
 )
 
 
@@ -24,11 +31,15 @@ def parse_args() -> argparse.Namespace:
 Examples:
   %(prog)s --vault-path ~/Documents/ObsidianVault
   %(prog)s --model-size small --chunk-duration 10
+  %(prog)s --streaming
 
 Environment variables:
   DICTWHISPERER_VAULT_PATH     Path to Obsidian vault
   DICTWHISPERER_MODEL_SIZE     Whisper model size (tiny, base, small, medium, large)
   DICTWHISPERER_CHUNK_DURATION Recording chunk duration in seconds
+  DICTWHISPERER_BACKEND        Inference backend (faster-whisper, openai-whisper, openvino)
+  DICTWHISPERER_LANGUAGE       Spoken language code, or "auto" to detect it
+  DICTWHISPERER_DEVICE         Inference device (auto, cpu, cuda, mps)
         """,
     )
 
@@ -45,22 +56,84 @@ Environment variables:
         default=os.environ.get("DICTWHISPERER_MODEL_SIZE", DEFAULT_MODEL_SIZE),
     )
 
+    chunk_duration_env = os.environ.get("DICTWHISPERER_CHUNK_DURATION")
     parser.add_argument(
         "--chunk-duration",
         type=int,
-        help="Recording chunk duration in seconds (default: 20)",
-        default=int(
-            os.environ.get("DICTWHISPERER_CHUNK_DURATION", DEFAULT_CHUNK_DURATION)
+        help=(
+            f"Longest recording chunk in seconds; chunks end earlier at a pause "
+            f"(default: {DEFAULT_CHUNK_DURATION}, or {DEFAULT_STREAMING_STEP} with --streaming)"
         ),
+        default=int(chunk_duration_env) if chunk_duration_env else None,
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Re-transcribe a rolling window every chunk and write words once two "
+            "passes agree; text appears after a couple of seconds instead of a full chunk"
+        ),
+    )
+
+    parser.add_argument(
+        "--vad-aggressiveness",
+        type=int,
+        choices=range(4),
+        help=(
+            "How readily speech is treated as a pause that ends a chunk, "
+            f"0 (least) to 3 (most) (default: {DEFAULT_VAD_AGGRESSIVENESS})"
+        ),
+        default=DEFAULT_VAD_AGGRESSIVENESS,
+    )
+
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Record fixed-length chunks instead of ending them at pauses",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help=(
+            "Transcribe a backlog of chunks in separate processes, each with its own "
+            "model copy (openai-whisper and openvino on the CPU only; not with --streaming)"
+        ),
+    )
+
+    parser.add_argument(
+        "--backend",
+        help="Inference backend (default: faster-whisper)",
+        choices=BACKENDS,
+        default=os.environ.get("DICTWHISPERER_BACKEND", DEFAULT_BACKEND),
+    )
+
+    parser.add_argument(
+        "--language",
+        help='Spoken language code, e.g. en, de, fr, or "auto" to detect it per chunk (default: en)',
+        default=os.environ.get("DICTWHISPERER_LANGUAGE", DEFAULT_LANGUAGE),
+    )
+
+    parser.add_argument(
+        "--device",
+        help="Inference device; auto picks CUDA, then Apple MPS, then CPU (default: auto)",
+        choices=DEVICES,
+        default=os.environ.get("DICTWHISPERER_DEVICE", DEFAULT_DEVICE),
+    )
+
+    args = parser.parse_args()
+    if args.chunk_duration is None:
+        args.chunk_duration = DEFAULT_STREAMING_STEP if args.streaming else DEFAULT_CHUNK_DURATION
+    return args
 
 
 def main() -> None:
     """Main entry point for the application."""
     args = parse_args()
 
+    from .dictwhisperer import DictationSession
+
     # Callbacks for CLI output
     def on_status_change(msg: str):
         print(f"[dictwhisperer] {msg}")
@@ -84,6 +157,12 @@ def main() -> None:
         vault_path=args.vault_path,
         model_size=args.model_size,
         chunk_duration=args.chunk_duration,
+        backend=args.backend,
+        language=None if args.language == "auto" else args.language,
+        device=args.device,
+        streaming=args.streaming,
+        vad_aggressiveness=None if args.no_vad else args.vad_aggressiveness,
+        parallel=args.parallel,
         on_status_change=on_status_change,
         on_progress=on_progress,
         on_transcription=on_transcription,
@@ -92,14 +171,23 @@ def main() -> None:
 
     try:
         session.initialize()
-        print(f"[dictwhisperer] Recording in {args.chunk_duration}-second chunks.")
+        if args.streaming:
+            print(f"[dictwhisperer] Streaming, re-transcribing every {args.chunk_duration} seconds.")
+        elif args.no_vad:
+            print(f"[dictwhisperer] Recording in {args.chunk_duration}-second chunks.")
+        else:
+            print(f"[dictwhisperer] Transcribing at each pause, at most every {args.chunk_duration} seconds.")
         print("[dictwhisperer] Press Ctrl+C to stop.\n")
         
         session.start()
         
-        # Keep main thread alive
-        while True:
-            time.sleep(0.1)
+        # Wait for the dictation thread. Joining in slices keeps Ctrl+C
+        # responsive on Windows, and a loop that died on an error ends the CLI.
+        while session.thread.is_alive():
+            session.thread.join(1.0)
+        session.stop()
+        if session.failed:
+            sys.exit(1)
 
     except KeyboardInterrupt:
         print("\n\n[dictwhisperer] Stopping...")
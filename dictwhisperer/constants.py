@@ -0,0 +1,22 @@
+"""
+Default configuration for DictWhisperer.
+
+Kept free of heavy imports so the CLI and GUI can read defaults without
+loading numpy, PortAudio or a Whisper backend.
+"""
+
+DEFAULT_VAULT_PATH = "/path/to/your/Obsidian/Vault"
+DEFAULT_MODEL_SIZE = "base"
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_CHANNELS = 1
+DEFAULT_CHUNK_DURATION = 20  # seconds
+DEFAULT_STREAMING_STEP = 2  # seconds between re-transcriptions in streaming mode
+DEFAULT_BACKEND = "faster-whisper"
+DEFAULT_LANGUAGE = "en"  # None lets Whisper detect the language per chunk
+DEFAULT_VAD_AGGRESSIVENESS = 2  # webrtcvad mode, 0 (least) to 3 (most aggressive)
+DEFAULT_DEVICE = "auto"  # CUDA, then Apple MPS (openai-whisper only), then CPU
+
+# Supported inference backends: CTranslate2 (int8 on CPU), the PyTorch
+# reference implementation, or OpenVINO IR exported once and cached on disk.
+BACKENDS = ("faster-whisper", "openai-whisper", "openvino")
+DEVICES = ("auto", "cpu", "cuda", "mps")
@@ -6,17 +6,38 @@ This module contains the core functionality for recording audio, processing it,
 and transcribing it using the Whisper model.
 """
 
+import functools
+import hashlib
 import itertools
+import multiprocessing
 import os
+import queue
 import shutil
 import sys
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Optional, Any, Callable
 
 import numpy as np
-import sounddevice as sd
+
+from .constants import (  # noqa: F401  (re-exported for existing imports)
+    DEFAULT_VAULT_PATH,
+    DEFAULT_MODEL_SIZE,
+    DEFAULT_SAMPLE_RATE,
+    DEFAULT_CHANNELS,
+    DEFAULT_CHUNK_DURATION,
+    DEFAULT_STREAMING_STEP,
+    DEFAULT_BACKEND,
+    DEFAULT_LANGUAGE,
+    DEFAULT_DEVICE,
+    DEFAULT_VAD_AGGRESSIVENESS,
+    BACKENDS,
+    DEVICES,
+)
+from .streaming import HypothesisBuffer
 
 # ---------------------------------------------------------------------------
 # Python version check
@@ -30,20 +51,280 @@ if not (MIN_SUPPORTED <= sys.version_info < MAX_SUPPORTED):
     print("Supported range : >=3.10,<3.14")
     sys.exit(1)
 
+
+def _write_parts(fd: int, parts: list) -> None:
+    """Write byte strings to fd with one gather syscall where available (not on Windows)."""
+    if hasattr(os, "writev"):
+        os.writev(fd, parts)
+    else:
+        os.write(fd, b"".join(parts))
+
+
+def _pick_device(backend: str) -> str:
+    """Return the fastest device backend can use here: CUDA, then Apple MPS (PyTorch only), then CPU."""
+    try:
+        if backend == "faster-whisper":
+            import ctranslate2
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        if backend == "openai-whisper":
+            import torch
+            if torch.cuda.is_available():
+                return "cuda"
+            mps = getattr(torch.backends, "mps", None)
+            if mps is not None and mps.is_available():
+                return "mps"
+    except Exception:
+        pass
+    return "cpu"
+
+
+# Larger PyTorch CPU allocator cache (used on Arm); must be set before torch
+# is imported, which happens lazily with the openai-whisper backend.
+os.environ.setdefault("LRU_CACHE_CAPACITY", "1024")
+
+
+# ---------------------------------------------------------------------------
+# Lazy imports
+# ---------------------------------------------------------------------------
+# sounddevice and the Whisper backends pull in PortAudio, torch or
+# CTranslate2, so they are imported on first use rather than with this module.
+sd = None
+whisper = None
+WhisperModel = None
+webrtcvad = None
+
+
+def _sounddevice():
+    global sd
+    if sd is None:
+        import sounddevice as sd
+    return sd
+
+
+def _openai_whisper():
+    global whisper
+    if whisper is None:
+        try:
+            import whisper
+        except ImportError:
+            raise RuntimeError("openai-whisper is not installed. Install it via pip install openai-whisper")
+    return whisper
+
+
+def _faster_whisper_model():
+    global WhisperModel
+    if WhisperModel is None:
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("faster-whisper is not installed. Install it via pip install faster-whisper")
+    return WhisperModel
+
+
+def _webrtcvad():
+    """Return the webrtcvad module, or None if it isn't installed."""
+    global webrtcvad
+    if webrtcvad is None:
+        try:
+            import webrtcvad
+        except ImportError:
+            return None
+    return webrtcvad
+
+
+# Downloaded models are cached in <project>/models. Resolved once at import.
+_MODEL_DIR = Path(__file__).resolve().parent.parent / "models"
+_MODEL_DIR_STR = os.fspath(_MODEL_DIR)
 try:
-    import whisper
-except ImportError:
-    print("Error: openai-whisper is not installed.")
-    print("Install it via pip install openai-whisper")
-    sys.exit(1)
+    _MODEL_DIR.mkdir(exist_ok=True)
+except OSError:
+    # Read-only install; the backend reports the problem when it loads
+    pass
+
+# Set once PortAudio has reported an input device; device enumeration is
+# slow on some USB audio stacks, so it is done at most once per process.
+# A missing microphone is not cached so a retry can pick up a new device.
+_HAS_INPUT_DEVICE = False
+
+# Number of recorded chunks allowed to wait for transcription. Keeps the
+# recorder one chunk ahead of the transcriber without unbounded buffering.
+AUDIO_QUEUE_SIZE = 2
+# Most chunks the transcription loop can hold at once: a full queue plus
+# the chunk it was working on when the queue filled up.
+MAX_BATCH_SIZE = AUDIO_QUEUE_SIZE + 1
+AUDIO_BLOCK_SIZE = 1024  # frames delivered per input stream callback
+
+# Streaming mode: longest stretch of audio re-transcribed at each step, and
+# how much already-committed text is passed back to Whisper as a prompt.
+STREAMING_WINDOW_SECONDS = 20
+STREAMING_PROMPT_CHARS = 200
+
+# int16 PCM -> float32 in [-1, 1)
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Voice activity detection
+SILENCE_THRESHOLD = 0.005  # RMS, as a fraction of full scale
+# The same threshold as a mean square in int16 units, for gating raw PCM
+_SILENCE_MEAN_SQ_INT16 = (SILENCE_THRESHOLD * 32768.0) ** 2
+VAD_FRAME_SECONDS = 0.02  # frame size for segmentation and silence trimming
+VAD_PADDING_SECONDS = 0.2  # audio kept around the first/last voiced frame
+VAD_END_SILENCE_SECONDS = 0.4  # pause that ends a VAD-bounded chunk
+# Sample rates and channel count webrtcvad accepts; otherwise frames are
+# classified with the RMS threshold above
+_WEBRTCVAD_RATES = (8000, 16000, 32000, 48000)
+
+
+DOWNLOAD_BLOCK_SIZE = 1 << 20  # bytes per read/write when downloading and hashing models
+DOWNLOAD_TIMEOUT = 30  # seconds a download may stall before it fails
+
+
+@functools.lru_cache(maxsize=None)
+def _openai_checkpoint(model_size: str) -> tuple:
+    """Return the download URL, SHA256 and local path of an openai-whisper checkpoint."""
+    url = _openai_whisper()._MODELS[model_size]
+    # The checkpoint's SHA256 is the second-to-last part of the URL path
+    return url, url.split("/")[-2], _MODEL_DIR / url.split("/")[-1]
+
+
+def _part_path(target_path: Path) -> Path:
+    """Where a download of target_path is kept until it is complete and verified."""
+    return target_path.with_name(target_path.name + ".part")
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    block = bytearray(DOWNLOAD_BLOCK_SIZE)
+    view = memoryview(block)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(block):
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+class _OpenVINOWhisper:
+    """
+    OpenVINO Whisper model behind the subset of openai-whisper's
+    transcribe() interface that DictationSession uses.
+
+    The first load exports the Hugging Face checkpoint to OpenVINO IR and
+    saves it to cache_dir; later loads read the cached IR directly.
+    """
+
+    WINDOW_SECONDS = 30  # Whisper's input length
+
+    def __init__(self, model_size: str, cache_dir: Path, ov_config: Optional[dict] = None):
+        try:
+            from optimum.intel import OVModelForSpeechSeq2Seq
+            from transformers import AutoProcessor
+        except ImportError:
+            raise RuntimeError(
+                "optimum-intel is not installed. Install it via pip install optimum-intel[openvino]"
+            )
+
+        if cache_dir.exists():
+            self.model = OVModelForSpeechSeq2Seq.from_pretrained(cache_dir, ov_config=ov_config, compile=True)
+            self.processor = AutoProcessor.from_pretrained(cache_dir)
+        else:
+            model_id = f"openai/whisper-{model_size}"
+            self.model = OVModelForSpeechSeq2Seq.from_pretrained(
+                model_id, export=True, ov_config=ov_config, compile=False
+            )
+            self.processor = AutoProcessor.from_pretrained(model_id)
+            self.model.save_pretrained(cache_dir)
+            self.processor.save_pretrained(cache_dir)
+            self.model.compile()
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None, **kwargs) -> dict:
+        """Transcribe a 16 kHz float32 array; other openai-whisper options are ignored.
+
+        The feature extractor truncates its input to 30 s, so longer audio is
+        split into 30 s windows that are decoded as one batch.
+        """
+        window = self.WINDOW_SECONDS * DEFAULT_SAMPLE_RATE
+        windows = [audio[start:start + window] for start in range(0, max(audio.size, 1), window)]
+        features = self.processor(
+            windows, sampling_rate=DEFAULT_SAMPLE_RATE, return_tensors="pt"
+        ).input_features
+        generate_kwargs = {"task": "transcribe"}
+        if language:
+            generate_kwargs["language"] = language
+        token_ids = self.model.generate(features, **generate_kwargs)
+        texts = self.processor.batch_decode(token_ids, skip_special_tokens=True)
+        return {"text": " ".join(text.strip() for text in texts)}
+
+
+@functools.lru_cache(maxsize=2)
+def _get_model(backend: str, model_size: str, device: str) -> Any:
+    """Load a model, keeping the last two in memory for later sessions.
+
+    Restarting dictation, e.g. from the GUI, then skips reading and
+    initializing the weights again. Failed loads are not cached.
+    """
+    if backend == "faster-whisper":
+        # FP16 on GPU; on CPU, CTranslate2 int8 kernels pick the best
+        # SIMD path for this machine
+        return _faster_whisper_model()(
+            model_size,
+            device=device,
+            compute_type="float16" if device == "cuda" else "int8",
+            cpu_threads=os.cpu_count() or 0,
+            # On GPU, lets queued chunks be transcribed concurrently. On CPU
+            # every worker would run cpu_threads threads of its own, so one
+            # worker keeps all cores for the chunk at hand.
+            num_workers=MAX_BATCH_SIZE if device == "cuda" else 1,
+            download_root=_MODEL_DIR_STR,
+        )
+    if backend == "openvino":
+        return _OpenVINOWhisper(model_size, _MODEL_DIR / f"{model_size}.ov")
+
+    try:
+        import torch
+        # Size the intra-op thread pool before the first inference
+        torch.set_num_threads(os.cpu_count() or 1)
+    except ImportError:
+        pass
+    return _openai_whisper().load_model(model_size, device=device, download_root=_MODEL_DIR_STR)
+
 
+# Transcriber of a parallel transcription worker process, and the barrier
+# its startup check waits on; both set by _init_worker
+_worker_transcriber = None
+_worker_barrier = None
+WORKER_START_TIMEOUT = 300  # seconds for every worker to load its model
 
-# Default configuration
-DEFAULT_VAULT_PATH = "/path/to/your/Obsidian/Vault"
-DEFAULT_MODEL_SIZE = "base"
-DEFAULT_SAMPLE_RATE = 16000
-DEFAULT_CHANNELS = 1
-DEFAULT_CHUNK_DURATION = 20  # seconds
+
+def _init_worker(backend: str, model_size: str, language: Optional[str], threads: int, barrier: Any) -> None:
+    """Load the model in a worker process, limited to threads inference threads."""
+    global _worker_transcriber, _worker_barrier
+    _worker_barrier = barrier
+    # Split the cores between the workers instead of oversubscribing them
+    if backend == "openvino":
+        # The main process has already exported the IR to the cache
+        model = _OpenVINOWhisper(
+            model_size, _MODEL_DIR / f"{model_size}.ov", ov_config={"INFERENCE_NUM_THREADS": threads}
+        )
+    else:
+        model = _get_model(backend, model_size, "cpu")
+        import torch
+        torch.set_num_threads(threads)
+    _worker_transcriber = _WorkerTranscriber(backend, language, model)
+
+
+def _worker_ready() -> None:
+    """Block until every worker has run _init_worker and reached this task.
+
+    A worker waiting here can't pick up another ready task, so one task per
+    worker only returns once each process has loaded its model.
+    """
+    _worker_barrier.wait(WORKER_START_TIMEOUT)
+
+
+def _transcribe_in_worker(audio_float: np.ndarray) -> str:
+    return _worker_transcriber._transcribe(audio_float)
+
+
+class Cancelled(Exception):
+    """Raised by DictationSession.initialize() when stop() is called before dictation starts."""
 
 
 class DictationSession:
@@ -60,6 +341,14 @@ class DictationSession:
         on_progress: Optional[Callable[[str], None]] = None,
         on_transcription: Optional[Callable[[str], None]] = None,
         on_error: Optional[Callable[[str], None]] = None,
+        *,
+        backend: str = DEFAULT_BACKEND,
+        language: Optional[str] = DEFAULT_LANGUAGE,
+        device: str = DEFAULT_DEVICE,
+        streaming: bool = False,
+        vad_aggressiveness: Optional[int] = DEFAULT_VAD_AGGRESSIVENESS,
+        max_chunk_duration: Optional[int] = None,
+        parallel: bool = False,
     ):
         """
         Initialize the dictation session.
@@ -67,15 +356,38 @@ class DictationSession:
         Args:
             vault_path: Path to the Obsidian vault.
             model_size: Whisper model size.
-            chunk_duration: Duration of each recording chunk in seconds.
+            chunk_duration: Duration of each recording chunk in seconds, or
+                the time between re-transcriptions in streaming mode.
             on_status_change: Callback for general status messages.
             on_progress: Callback for progress updates (e.g., countdown).
             on_transcription: Callback when text is successfully transcribed.
             on_error: Callback for error messages.
+            backend: Inference backend, one of BACKENDS.
+            language: Spoken language code, or None to auto-detect each chunk.
+            device: Inference device, one of DEVICES.
+            streaming: Re-transcribe a rolling window every chunk_duration
+                seconds and commit words once two passes agree, instead of
+                transcribing each chunk once.
+            vad_aggressiveness: webrtcvad mode (0-3). Chunks end at the first
+                pause in speech instead of after a fixed duration; None
+                records fixed chunk_duration chunks. Ignored when streaming.
+            max_chunk_duration: Longest VAD-bounded chunk in seconds;
+                defaults to chunk_duration.
+            parallel: Transcribe a backlog of chunks in worker processes, each
+                with its own copy of the model. Only used by the PyTorch and
+                OpenVINO backends on the CPU, and not when streaming.
         """
         self.vault_path = Path(os.path.expanduser(vault_path)).resolve()
         self.model_size = model_size
         self.chunk_duration = chunk_duration
+        self.backend = backend
+        self.language = language
+        self.device = device
+        self._device = "cpu"  # resolved when the model is loaded
+        self.streaming = streaming
+        self.vad_aggressiveness = vad_aggressiveness
+        self.max_chunk_duration = max_chunk_duration
+        self.parallel = parallel
         self.on_status_change = on_status_change or (lambda x: None)
         self.on_progress = on_progress or (lambda x: None)
         self.on_transcription = on_transcription or (lambda x: None)
@@ -83,15 +395,56 @@ class DictationSession:
 
         self.model = None
         self.is_running = False
+        self.failed = False  # set when the dictation loop stops on an error
         self.stop_event = threading.Event()
+        # Makes start()'s cancel check and stop()'s not-started branch atomic
+        self._start_lock = threading.Lock()
         self.thread = None
         self.md_filename = None
+        self._md_fd = None
+        self._pool = None
+
+        # Capture state, owned by the input stream callback while running
+        self._stream = None
+        self._audio_queue = None
+        self._free_buffers = None
+        self._buf = None
+        self._cursor = 0
+        self._chunk_frames = 0
+        self._channels = DEFAULT_CHANNELS
+        self._frame_bytes = 2 * DEFAULT_CHANNELS
+        self._samplerate = DEFAULT_SAMPLE_RATE
+        self._reported_second = -1
+        self._dropped_chunks = 0
+        self._overflows = 0  # input blocks PortAudio lost before the callback ran
+        self._float_bufs = []
+
+        # Pause segmentation state, also owned by the callback. _vad_frame is
+        # 0 when chunks have a fixed length.
+        self._vad = None
+        self._vad_frame = 0
+        self._vad_pos = 0  # frames of the current chunk already classified
+        self._speaking = False
+        self._silent_frames = 0  # trailing non-speech frames since speech
+        self._end_silence_frames = 0
+        self._preroll_frames = 0
+
+        # Streaming state: rolling float32 window and the agreement buffer
+        self._hypothesis = None
+        self._rolling = None
+        self._rolling_len = 0
+        self._rolling_offset = 0.0  # session time (s) at which the window starts
+        self._prompt_words = []
 
     def initialize(self):
         """Perform pre-flight checks and load the model."""
+        self.stop_event.clear()
         self.on_status_change("Initializing...")
         self.on_progress("Initializing: Checking system...")
         
+        if self.streaming and self.backend == "openvino":
+            raise ValueError("Streaming needs word timestamps, which the openvino backend does not provide.")
+
         # System checks
         self._ensure_ffmpeg()
         self._check_audio_devices()
@@ -101,193 +454,887 @@ class DictationSession:
             raise FileNotFoundError(f"Obsidian vault path does not exist: {self.vault_path}")
         if not self.vault_path.is_dir():
             raise NotADirectoryError(f"Vault path is not a directory: {self.vault_path}")
+        if not os.access(self.vault_path, os.W_OK):
+            raise PermissionError(f"Vault path is not writable: {self.vault_path}")
 
         # Create session file
-        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+        # Read the clock once so the file name and header can't disagree
+        now = time.localtime()
+        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S", now)
+        started_at = time.strftime("%Y-%m-%d %H:%M:%S", now)
         self.md_filename = self.vault_path / f"LiveDictation_{timestamp}.md"
         try:
-            with open(self.md_filename, "w", encoding="utf-8") as f:
-                f.write(f"# Live Dictation - {timestamp}\n\n")
-                f.write(f"*Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
+            # Raw O_APPEND descriptor kept open for the whole session: each
+            # transcription is one unbuffered write, with no seek or flush
+            self._md_fd = os.open(
+                self.md_filename,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND | getattr(os, "O_BINARY", 0),
+                0o644,
+            )
+            _write_parts(self._md_fd, [
+                f"# Live Dictation - {timestamp}\n\n".encode("utf-8"),
+                f"*Started at: {started_at}*\n\n".encode("utf-8"),
+            ])
             self.on_status_change(f"Created file: {self.md_filename.name}")
         except Exception as e:
             raise IOError(f"Cannot write to vault path: {e}")
 
-        # Download Model if needed
-        self._ensure_model_downloaded()
+        try:
+            # Download Model if needed (faster-whisper fetches its own weights)
+            if self.backend == "openai-whisper":
+                self._ensure_model_downloaded()
+
+            # Load model
+            self.on_status_change(f"Loading Whisper model '{self.model_size}' into memory...")
+            self.on_progress("Loading model...")
+            self.model = self._load_whisper_model(self.model_size)
+            if self.backend == "openai-whisper":
+                self._remove_stale_download()
+            if self.stop_event.is_set():
+                raise Cancelled("Stopped while loading the model.")
+        except BaseException:
+            self._close_transcript()
+            raise
 
-        # Load model
-        self.on_status_change(f"Loading Whisper model '{self.model_size}' into memory...")
-        self.on_progress("Loading model...")
-        self.model = self._load_whisper_model(self.model_size)
+        if self.parallel:
+            self._pool = self._start_pool()
         self.on_status_change("Ready.")
         self.on_progress("Ready to dictate.")
 
     def _ensure_model_downloaded(self):
-        """Check if model exists, if not, download with progress."""
-        project_root = Path(__file__).resolve().parent.parent
-        model_dir = project_root / "models"
-        model_dir.mkdir(exist_ok=True)
-        
-        # Whisper stores models as "name.pt" usually, but let's check standard behavior.
-        # We will use whisper's internal logic to get the URL, but handle download manually.
+        """Download the openai-whisper checkpoint with progress, resuming a partial download."""
         try:
-            import urllib.request
-            url = whisper._MODELS[self.model_size]
-            filename = url.split("/")[-1]
-            target_path = model_dir / filename
-            
+            url, expected_sha256, target_path = _openai_checkpoint(self.model_size)
+
             if target_path.exists():
-                # We could check SHA256 here, but for now assume existence is enough for speed
-                # or let whisper verify it later.
+                # whisper.load_model verifies the checksum itself
                 return
 
             self.on_status_change(f"Downloading model '{self.model_size}'...")
-            
-            def report_hook(block_num, block_size, total_size):
-                if total_size > 0:
-                    percent = (block_num * block_size * 100) / total_size
-                    self.on_progress(f"Downloading: {percent:.1f}%")
-            
             print(f"[dictwhisperer] Downloading {url} to {target_path}")
-            urllib.request.urlretrieve(url, target_path, reporthook=report_hook)
+            part_path = _part_path(target_path)
+            self._download(url, part_path)
+
+            if _sha256_file(part_path) != expected_sha256:
+                part_path.unlink()
+                raise RuntimeError("SHA256 checksum does not match")
+            os.replace(part_path, target_path)
             self.on_progress("Download complete.")
-            
+
+        except Cancelled:
+            raise
         except Exception as e:
             # Fallback to default whisper download if manual fails
             print(f"Manual download failed: {e}. Falling back to default.")
             pass
 
+    def _remove_stale_download(self) -> None:
+        """Delete a partial download once whisper's own download has fetched the checkpoint."""
+        target_path = _openai_checkpoint(self.model_size)[2]
+        if target_path.exists():
+            try:
+                _part_path(target_path).unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _download(self, url: str, part_path: Path) -> None:
+        """Append the rest of url to part_path, picking up where an earlier attempt stopped.
+
+        Raises Cancelled between blocks once stop() is called; the timeout
+        bounds how long a stalled read can delay that.
+        """
+        import urllib.error
+        import urllib.request
+
+        done = part_path.stat().st_size if part_path.exists() else 0
+        request = urllib.request.Request(url, headers={"Range": f"bytes={done}-"} if done else {})
+        try:
+            response = urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT)
+        except urllib.error.HTTPError as e:
+            if e.code == 416:
+                # Nothing left to fetch; the checksum decides if it's complete
+                return
+            raise
+
+        with response, open(part_path, "ab") as f:
+            if response.status != 206:
+                # The server ignored the range and is sending the whole file
+                f.truncate(0)
+                done = 0
+            total = done + int(response.headers.get("Content-Length") or 0)
+            block = bytearray(DOWNLOAD_BLOCK_SIZE)
+            view = memoryview(block)
+            while True:
+                if self.stop_event.is_set():
+                    raise Cancelled("Model download cancelled.")
+                n = response.readinto(block)
+                if not n:
+                    break
+                f.write(view[:n])
+                done += n
+                if total:
+                    self.on_progress(f"Downloading: {done * 100 / total:.1f}%")
+
     def _load_whisper_model(self, model_size: str) -> Any:
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{self.backend}'. Choose one of: {', '.join(BACKENDS)}")
+
+        self._device = self._resolve_device()
+        self.on_status_change(f"Using device: {self._device}")
+
+        try:
+            return self._load_warm_model(model_size)
+        except Exception as e:
+            if self.device != "auto" or self._device == "cpu":
+                raise RuntimeError(f"Error loading Whisper model: {e}")
+            # An auto-detected accelerator that can't run the model is not
+            # fatal. Missing CUDA libraries often only fail on the first
+            # inference, so the warm-up counts as part of loading. The model
+            # that failed must not be handed to a later session
+            # (lru_cache can't evict a single entry).
+            _get_model.cache_clear()
+            self.on_status_change(f"Could not run model on {self._device} ({e}); falling back to CPU.")
+            self._device = "cpu"
+            try:
+                return self._load_warm_model(model_size)
+            except Exception as e:
+                raise RuntimeError(f"Error loading Whisper model: {e}")
+
+    def _load_warm_model(self, model_size: str) -> Any:
+        """Load the model on self._device and warm it up if it was not cached."""
+        loads = _get_model.cache_info().misses
+        model = _get_model(self.backend, model_size, self._device)
+        if _get_model.cache_info().misses == loads:
+            # Reused from an earlier session, so it is already warm
+            return model
+        try:
+            self._warm_up_model(model)
+        except Exception as e:
+            if self.device == "auto" and self._device != "cpu":
+                # _load_whisper_model retries on the CPU
+                raise
+            # Only costs latency on the first chunk, unless the model can't
+            # run at all, in which case the user needs to know now
+            self.on_error(f"Model warm-up failed: {e}")
+        return model
+
+    def _start_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Start the worker processes for parallel transcription, or return None if they wouldn't help."""
+        cpus = os.cpu_count() or 1
+        workers = min(MAX_BATCH_SIZE, cpus)
+        if self.backend == "faster-whisper":
+            # CTranslate2 already spreads each chunk over every core
+            reason = "faster-whisper already uses every core"
+        elif self._device != "cpu":
+            # Processes sharing one GPU gain nothing
+            reason = f"it only runs on the CPU, not {self._device}"
+        elif self.streaming:
+            # Streaming transcribes one rolling window at a time
+            reason = "streaming has no backlog of chunks"
+        elif workers < 2:
+            reason = "this machine has a single core"
+        else:
+            reason = None
+        if reason:
+            self.on_status_change(f"Parallel transcription not used: {reason}.")
+            return None
+
+        self.on_status_change(f"Starting {workers} transcription workers...")
+        # Forking a process that has loaded a model and started threads can
+        # deadlock, so workers always start a fresh interpreter
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.backend, self.model_size, self.language, max(1, cpus // workers), context.Barrier(workers)),
+        )
         try:
-            project_root = Path(__file__).resolve().parent.parent
-            model_dir = project_root / "models"
-            model_dir.mkdir(exist_ok=True)
-            return whisper.load_model(model_size, download_root=str(model_dir))
+            # Every model is loaded before dictation starts
+            for future in [pool.submit(_worker_ready) for _ in range(workers)]:
+                future.result()
         except Exception as e:
-            raise RuntimeError(f"Error loading Whisper model: {e}")
+            pool.shutdown(cancel_futures=True)
+            self.on_status_change(f"Parallel transcription unavailable ({e}); transcribing serially.")
+            return None
+        return pool
+
+    def _resolve_device(self) -> str:
+        """Return the device to run on, detecting the best one when set to "auto"."""
+        if self.device not in DEVICES:
+            raise ValueError(f"Unknown device '{self.device}'. Choose one of: {', '.join(DEVICES)}")
+        if self.backend == "openvino" and self.device not in ("auto", "cpu"):
+            raise ValueError("The openvino backend runs on the CPU; use device 'auto' or 'cpu'.")
+        if self.backend == "faster-whisper" and self.device == "mps":
+            raise ValueError("faster-whisper does not support Apple MPS; use device 'auto', 'cpu' or 'cuda'.")
+        if self.device != "auto":
+            return self.device
+        return _pick_device(self.backend)
+
+    def _warm_up_model(self, model: Any) -> None:
+        """Run one inference on silence so the first real chunk isn't slowed by JIT/kernel setup.
+
+        Also the first point where a device that can't run the model fails.
+        """
+        self.on_progress("Warming up model...")
+        silence = np.zeros(DEFAULT_SAMPLE_RATE, dtype=np.float32)
+        if self.backend == "faster-whisper":
+            # Chunks are transcribed with vad_filter=True, which loads the
+            # Silero VAD model on first use. Load it here, separately,
+            # because the filter would drop all of this silence and skip
+            # the Whisper pass below.
+            from faster_whisper.vad import get_speech_timestamps
+            get_speech_timestamps(silence)
+            segments, _ = model.transcribe(silence, language=self.language, beam_size=1)
+            # Segments are generated lazily; consume them to run the model
+            list(segments)
+        else:
+            model.transcribe(
+                silence,
+                fp16=self._device != "cpu",
+                language=self.language,
+                no_speech_threshold=1.0,
+            )
 
     def start(self):
-        """Start the dictation loop in a background thread."""
-        if self.is_running:
-            return
+        """Start the dictation loop in a background thread.
 
-        self.is_running = True
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self._run_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        Raises Cancelled, and closes the session file, if stop() was called
+        after initialize().
+        """
+        with self._start_lock:
+            if self.is_running:
+                return
+            if self.stop_event.is_set():
+                self._close_transcript()
+                raise Cancelled("Stopped before dictation started.")
+
+            self._open_stream()
+            self.is_running = True
+            self.thread = threading.Thread(target=self._run_loop)
+            self.thread.daemon = True
+            self.thread.start()
         self.on_status_change("Dictation started.")
 
     def stop(self):
-        """Stop the dictation loop."""
-        if not self.is_running:
-            return
+        """Stop recording, transcribe the audio still in flight and close the session file.
+
+        Before start(), this cancels a running initialize() instead.
+        """
+        with self._start_lock:
+            if self.thread is None:
+                self.stop_event.set()
+                return
 
         self.is_running = False
+        # Stop capturing first, then let the loop drain what was recorded,
+        # including the partly filled chunk, before it exits.
+        self._close_stream()
+        self._queue_partial_chunk()
         self.stop_event.set()
-        if self.thread:
-            self.thread.join()
+        self._queue_stop_marker()
+        self.thread.join()
+        self.thread = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._close_transcript()
         self.on_status_change("Dictation stopped.")
 
-    def _run_loop(self):
-        """Main recording loop."""
-        try:
-            while self.is_running and not self.stop_event.is_set():
-                audio_data = self._record_audio(duration=self.chunk_duration)
-                if self.stop_event.is_set():
-                    break
-                self._transcribe_and_append(audio_data)
-        except Exception as e:
-            self.on_error(f"Error in dictation loop: {e}")
-            self.is_running = False
+    def _open_stream(self, samplerate: int = DEFAULT_SAMPLE_RATE, channels: int = DEFAULT_CHANNELS) -> None:
+        """Open the microphone stream for the lifetime of the session.
+
+        A raw int16 stream callback copies incoming PCM bytes into
+        preallocated bytearray chunk buffers; a full buffer is queued for
+        transcription and replaced by a free one, so the capture path never
+        allocates or builds NumPy arrays.
+
+        Unless streaming, each chunk ends at the first pause in speech (or
+        once max_chunk_duration is reached), and silence between utterances
+        is recorded over rather than queued.
+        """
+        segment = not self.streaming and self.vad_aggressiveness is not None
+        duration = (self.max_chunk_duration or self.chunk_duration) if segment else self.chunk_duration
+        self._chunk_frames = int(duration * samplerate)
+        self._channels = channels
+        self._frame_bytes = 2 * channels  # int16
+        self._samplerate = samplerate
+        self._audio_queue = queue.Queue(maxsize=AUDIO_QUEUE_SIZE)
+        self._free_buffers = queue.SimpleQueue()
+        chunk_bytes = self._chunk_frames * self._frame_bytes
+        # Enough buffers for a full queue plus the one being transcribed
+        for _ in range(AUDIO_QUEUE_SIZE + 1):
+            self._free_buffers.put(bytearray(chunk_bytes))
+        self._buf = bytearray(chunk_bytes)
+        # float32 scratch for each chunk of a batch; streaming converts
+        # straight into its rolling window instead
+        self._float_bufs = [] if self.streaming else [
+            np.empty(self._chunk_frames * channels, dtype=np.float32)
+            for _ in range(MAX_BATCH_SIZE)
+        ]
+        self._cursor = 0
+        self._reported_second = -1
+        self._dropped_chunks = 0
+        self._overflows = 0
+
+        self._vad = None
+        self._vad_frame = 0
+        if segment:
+            vad_module = _webrtcvad()
+            if vad_module is not None and channels == 1 and samplerate in _WEBRTCVAD_RATES:
+                self._vad = vad_module.Vad(self.vad_aggressiveness)
+            self._vad_frame = int(VAD_FRAME_SECONDS * samplerate)
+            self._end_silence_frames = int(VAD_END_SILENCE_SECONDS * samplerate)
+            self._preroll_frames = int(VAD_PADDING_SECONDS * samplerate)
+        self._reset_segment()
+
+        if self.streaming:
+            # Room for a full window plus a batch of steps before it is trimmed
+            capacity = int((STREAMING_WINDOW_SECONDS + self.chunk_duration * MAX_BATCH_SIZE) * samplerate)
+            self._rolling = np.empty(capacity, dtype=np.float32)
+            self._rolling_len = 0
+            self._rolling_offset = 0.0
+            self._hypothesis = HypothesisBuffer()
+            self._prompt_words = []
 
-    def _record_audio(self, duration: int, samplerate: int = DEFAULT_SAMPLE_RATE, channels: int = DEFAULT_CHANNELS) -> np.ndarray:
-        """Record audio with progress updates."""
         try:
-            start_time = time.time()
-            
-            # Start recording
-            audio = sd.rec(
-                int(duration * samplerate),
+            # The default (high) input latency is kept deliberately: a larger
+            # host buffer rides out GIL stalls while a chunk is transcribed,
+            # and capture latency adds nothing to transcription latency.
+            self._stream = _sounddevice().RawInputStream(
                 samplerate=samplerate,
                 channels=channels,
                 dtype="int16",
+                blocksize=AUDIO_BLOCK_SIZE,
+                callback=self._audio_callback,
             )
-            
-            # Progress loop while recording
-            while time.time() - start_time < duration:
-                if self.stop_event.is_set():
-                    sd.stop()
-                    return np.array([]) # Return empty array on stop
-
-                elapsed = time.time() - start_time
-                remaining = max(0, duration - elapsed)
-                self.on_progress(f"Recording: {int(np.ceil(remaining))}s")
-                time.sleep(0.1)
-                
-            sd.wait()
-            self.on_progress("Processing...")
-            return audio
+            self._stream.start()
+        except Exception as e:
+            self._stream = None
+            raise RuntimeError(f"Error opening audio input stream: {e}")
 
+    def _close_stream(self) -> None:
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
         except Exception as e:
-            self.on_error(f"Error recording audio: {e}")
-            raise
+            self.on_error(f"Error closing audio input stream: {e}")
+        self._stream = None
+
+    def _close_transcript(self) -> None:
+        if self._md_fd is None:
+            return
+        try:
+            os.close(self._md_fd)
+        except OSError as e:
+            self.on_error(f"Error closing transcript file: {e}")
+        self._md_fd = None
+
+    def _audio_callback(self, indata: Any, frames: int, time_info: Any, status: Any) -> None:
+        """Input stream callback; runs on the audio thread and must not block.
+
+        Also drives the recording countdown, once per second of captured audio.
+        """
+        if status and status.input_overflow:
+            self._overflows += 1
+        data = memoryview(indata).cast("B")
+        frame_bytes = self._frame_bytes
+        offset = 0
+        while offset < frames:
+            n = min(frames - offset, self._chunk_frames - self._cursor)
+            start = self._cursor * frame_bytes
+            self._buf[start:start + n * frame_bytes] = data[offset * frame_bytes:(offset + n) * frame_bytes]
+            self._cursor += n
+            offset += n
+            if self._vad_frame:
+                self._segment()
+            if self._cursor == self._chunk_frames:
+                self._hand_off_chunk()
+
+        if self._vad_frame and not self._speaking:
+            elapsed = None
+        else:
+            elapsed = self._cursor // self._samplerate
+        if elapsed != self._reported_second:
+            self._reported_second = elapsed
+            if elapsed is None:
+                self.on_progress("Listening...")
+            else:
+                self.on_progress(f"Recording: {self._chunk_frames // self._samplerate - elapsed}s")
+
+    def _segment(self) -> None:
+        """Classify the newly captured VAD frames and end the chunk at a pause.
+
+        Until speech starts only the last VAD_PADDING_SECONDS are kept, so a
+        chunk starts just before its first word and silence is never queued.
+        """
+        frame = self._vad_frame
+        frame_bytes = self._frame_bytes
+        buf = memoryview(self._buf)
+        while self._vad_pos + frame <= self._cursor:
+            start = self._vad_pos * frame_bytes
+            self._vad_pos += frame
+            if self._is_speech(buf[start:start + frame * frame_bytes]):
+                self._speaking = True
+                self._silent_frames = 0
+            elif self._speaking:
+                self._silent_frames += frame
+                if self._silent_frames >= self._end_silence_frames:
+                    self._hand_off_chunk()
+                    return
+
+        if not self._speaking and self._cursor >= 2 * self._preroll_frames:
+            # Keep the pre-roll; the source and destination don't overlap
+            keep = self._preroll_frames * frame_bytes
+            end = self._cursor * frame_bytes
+            buf[:keep] = buf[end - keep:end]
+            self._vad_pos -= self._cursor - self._preroll_frames
+            self._cursor = self._preroll_frames
+
+    def _is_speech(self, frame: memoryview) -> bool:
+        if self._vad is not None:
+            # webrtcvad only accepts immutable bytes
+            return self._vad.is_speech(bytes(frame), self._samplerate)
+        return not self._is_silent(np.frombuffer(frame, dtype=np.int16))
+
+    def _reset_segment(self) -> None:
+        self._vad_pos = 0
+        self._speaking = False
+        self._silent_frames = 0
+
+    def _hand_off_chunk(self) -> None:
+        """Queue the recorded chunk and continue into a free buffer."""
+        try:
+            next_buf = self._free_buffers.get_nowait()
+        except queue.Empty:
+            next_buf = None
+        if next_buf is not None:
+            try:
+                self._audio_queue.put_nowait(memoryview(self._buf)[:self._cursor * self._frame_bytes])
+                self._buf = next_buf
+            except queue.Full:
+                self._free_buffers.put(next_buf)
+                next_buf = None
+        if next_buf is None:
+            # Transcription has fallen behind; record over this chunk
+            self._dropped_chunks += 1
+        self._cursor = 0
+        self._reset_segment()
+
+    def _queue_partial_chunk(self) -> None:
+        """Queue the audio recorded since the last full chunk; called once capture has stopped."""
+        if self._cursor == 0 or self._audio_queue is None:
+            return
+        if self._vad_frame and not self._speaking:
+            # Only the pre-roll of an utterance that never started
+            self._cursor = 0
+            return
+        # Capture has stopped, so waiting for room costs no audio; the queue
+        # is full precisely when transcription is behind
+        if not self._put_for_loop(memoryview(self._buf)[:self._cursor * self._frame_bytes]):
+            self._dropped_chunks += 1
+        self._cursor = 0
+
+    def _queue_stop_marker(self) -> None:
+        """Queue None to end the loop once it has transcribed everything before it."""
+        self._put_for_loop(None)
+
+    def _put_for_loop(self, item: Any) -> bool:
+        """Queue item, waiting while the loop catches up; False if the loop is no longer running."""
+        while self.thread is not None and self.thread.is_alive():
+            try:
+                self._audio_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run_loop(self):
+        """Main transcription loop.
+
+        Audio is captured by the input stream callback, so the microphone
+        keeps recording while the previous chunk is being transcribed. Queued
+        chunks are memoryviews of pooled bytearrays. The loop blocks until a
+        chunk arrives; stop() queues None behind the last chunk, so all
+        recorded speech is transcribed before the loop exits.
+        """
+        reported_drops = 0
+        reported_overflows = 0
+        stopping = False
+        try:
+            while not stopping:
+                batch = [self._audio_queue.get()]
+
+                # Pick up any chunks that queued while the last one was transcribed
+                while True:
+                    try:
+                        batch.append(self._audio_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    stopping = True
+                    batch.pop()
+                    if not batch:
+                        break
+
+                try:
+                    self.on_progress("Processing...")
+                    # Zero-copy int16 views of the raw chunk buffers
+                    audio_batch = [
+                        np.frombuffer(buf, dtype=np.int16).reshape(-1, self._channels)
+                        for buf in batch
+                    ]
+                    if self.streaming:
+                        self._stream_step(audio_batch)
+                    elif len(audio_batch) == 1:
+                        self._transcribe_and_append(audio_batch[0])
+                    else:
+                        self._transcribe_batch(audio_batch)
+                finally:
+                    for view in batch:
+                        self._free_buffers.put(view.obj)
+
+                if self._dropped_chunks != reported_drops:
+                    reported_drops = self._dropped_chunks
+                    self.on_status_change(
+                        f"Transcription is falling behind; {reported_drops} chunk(s) dropped."
+                    )
+                if self._overflows != reported_overflows:
+                    reported_overflows = self._overflows
+                    self.on_status_change(
+                        f"Audio input overflowed {reported_overflows} time(s); some audio was lost."
+                    )
+
+            if self.streaming:
+                # Keep the words that were still waiting for a second pass
+                self._append_words(self._hypothesis.complete())
+        except Exception as e:
+            self.on_error(f"Error in dictation loop: {e}")
+            self.failed = True
+            self.is_running = False
 
     def _transcribe_and_append(self, audio_data: np.ndarray) -> None:
         """Transcribe audio and append to file."""
-        if audio_data.size == 0:
-            return
+        try:
+            audio_float = self._prepare_audio(audio_data)
+            if audio_float is None:
+                return
+
+            self.on_status_change("Transcribing...")
+            self._append_text(self._transcribe(audio_float))
+
+        except Exception as e:
+            self.on_error(f"Error during transcription: {e}")
 
+    def _transcribe_batch(self, batch: list) -> None:
+        """Transcribe several queued chunks, appending the text in recording order.
+
+        CTranslate2 releases the GIL while decoding, so with faster-whisper on
+        a GPU the chunks run in parallel threads. On the CPU a single chunk
+        already uses all cores, so chunks run one after another unless
+        worker processes were started (parallel=True).
+        """
         try:
-            # Whisper expects a 1D float array normalized between -1 and 1
-            audio_float = audio_data.flatten().astype(np.float32) / 32768.0
+            prepared = [self._prepare_audio(audio_data, slot) for slot, audio_data in enumerate(batch)]
+            voiced = [audio_float for audio_float in prepared if audio_float is not None]
+            if not voiced:
+                return
+
+            self.on_status_change(f"Transcribing {len(voiced)} queued chunks...")
+            if self.backend == "faster-whisper" and self._device == "cuda":
+                with ThreadPoolExecutor(max_workers=min(MAX_BATCH_SIZE, len(voiced))) as executor:
+                    texts = list(executor.map(self._transcribe, voiced))
+            else:
+                texts = self._transcribe_in_pool(voiced) if self._pool is not None else None
+                if texts is None:
+                    texts = [self._transcribe(audio_float) for audio_float in voiced]
 
-            # Simple Voice Activity Detection (VAD) based on RMS amplitude
-            rms = np.sqrt(np.mean(audio_float**2))
-            threshold = 0.005  # Silence threshold
+            self._append_texts(texts)
 
-            if rms < threshold:
-                # self.on_status_change(f"Silence detected (RMS: {rms:.4f}). Skipping.")
+        except Exception as e:
+            self.on_error(f"Error during transcription: {e}")
+
+    def _transcribe_in_pool(self, voiced: list) -> Optional[list]:
+        """Transcribe chunks in the worker processes, or return None if the pool has broken.
+
+        A worker that dies (e.g. killed for memory) breaks the pool for good,
+        so it is shut down and the session continues serially.
+        """
+        try:
+            return list(self._pool.map(_transcribe_in_worker, voiced))
+        except BrokenProcessPool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.on_status_change("A transcription worker stopped; transcribing serially.")
+            return None
+
+    def _prepare_audio(self, audio_data: np.ndarray, slot: int = 0) -> Optional[np.ndarray]:
+        """Trim an int16 chunk and convert it to float32, or return None if it is silent.
+
+        Each slot has its own float buffer so chunks in a batch don't overwrite
+        each other.
+        """
+        if audio_data.size == 0:
+            return None
+
+        flat = audio_data.ravel()
+        # VAD-bounded chunks are known to contain speech
+        if not self._vad_frame and self._is_silent(flat):
+            # self.on_status_change("Silence detected. Skipping.")
+            return None
+
+        # Trimming first means only the voiced span is converted
+        flat = self._trim_silence(flat)
+
+        # Whisper expects a 1D float array normalized between -1 and 1.
+        # ravel() is a view of the contiguous chunk, and the ufunc casts and
+        # scales it in one buffered pass straight into a reusable float buffer.
+        while len(self._float_bufs) <= slot:
+            self._float_bufs.append(np.empty(0, dtype=np.float32))
+        if self._float_bufs[slot].size < flat.size:
+            self._float_bufs[slot] = np.empty(flat.size, dtype=np.float32)
+        audio_float = self._float_bufs[slot][:flat.size]
+        np.multiply(flat, _INT16_SCALE, out=audio_float)
+        return audio_float
+
+    def _is_silent(self, flat: np.ndarray) -> bool:
+        """Simple Voice Activity Detection (VAD) based on RMS amplitude.
+
+        Computed on the raw int16 samples so silent chunks are skipped before
+        any float conversion. einsum accumulates in int64 (a plain int16 dot
+        product would overflow) without a squared temporary.
+        """
+        sum_sq = int(np.einsum("i,i->", flat, flat, dtype=np.int64))
+        return sum_sq < _SILENCE_MEAN_SQ_INT16 * flat.size
+
+    def _stream_step(self, batch: list, samplerate: int = DEFAULT_SAMPLE_RATE) -> None:
+        """Add new audio to the rolling window, re-transcribe it and commit agreed words."""
+        try:
+            silent = True
+            for audio_data in batch:
+                flat = audio_data.ravel()
+                silent = silent and self._is_silent(flat)
+                self._rolling_append(flat, samplerate)
+
+            if silent and not self._hypothesis.complete():
+                # Everything said so far is committed; don't keep re-reading the pause
+                self._rolling_trim(self._rolling_len, samplerate)
                 return
 
             self.on_status_change("Transcribing...")
-            
-            # Explicitly disable fp16 to avoid warnings on CPU
-            result = self.model.transcribe(audio_float, fp16=False)
-            text = result["text"].strip()
-
-            if text:
-                with open(self.md_filename, "a", encoding="utf-8") as f:
-                    f.write(f" {text}")
-                self.on_transcription(text)
-                self.on_status_change("Transcribed.")
-            # else:
-            #     self.on_status_change("No speech detected.")
+            prompt = " ".join(self._prompt_words)[-STREAMING_PROMPT_CHARS:]
+            words = self._transcribe_words(self._rolling[:self._rolling_len], prompt)
+            self._hypothesis.insert(words, self._rolling_offset)
+            self._append_words(self._hypothesis.flush())
+
+            window = STREAMING_WINDOW_SECONDS * samplerate
+            if self._rolling_len > window:
+                # Cut after the last committed word, or just keep the newest
+                # window if too little has been committed to get under it
+                cut = int((self._hypothesis.last_committed_time - self._rolling_offset) * samplerate)
+                if cut <= 0 or self._rolling_len - cut > window:
+                    cut = self._rolling_len - window
+                self._rolling_trim(cut, samplerate)
 
         except Exception as e:
             self.on_error(f"Error during transcription: {e}")
 
+    def _rolling_append(self, flat: np.ndarray, samplerate: int) -> None:
+        overflow = self._rolling_len + flat.size - self._rolling.size
+        if overflow > 0:
+            self._rolling_trim(overflow, samplerate)
+        end = self._rolling_len + flat.size
+        np.multiply(flat, _INT16_SCALE, out=self._rolling[self._rolling_len:end])
+        self._rolling_len = end
+
+    def _rolling_trim(self, n_samples: int, samplerate: int) -> None:
+        """Drop the oldest n_samples of the rolling window."""
+        n_samples = min(n_samples, self._rolling_len)
+        cut_time = self._rolling_offset + n_samples / samplerate
+        # Words whose audio is dropped can't be confirmed by a later pass
+        self._append_words(self._hypothesis.commit_before(cut_time))
+        popped = self._hypothesis.pop_committed(cut_time)
+        self._prompt_words = (self._prompt_words + [word[2] for word in popped])[-50:]
+
+        remaining = self._rolling_len - n_samples
+        self._rolling[:remaining] = self._rolling[n_samples:self._rolling_len]
+        self._rolling_len = remaining
+        self._rolling_offset = cut_time
+
+    def _append_words(self, words: list) -> None:
+        self._append_text(" ".join(word[2] for word in words))
+
+    def _append_text(self, text: str) -> None:
+        """Append transcribed text to the session file."""
+        self._append_texts([text])
+
+    def _append_texts(self, texts: list) -> None:
+        """Append several transcriptions, in order, with a single write."""
+        texts = [text for text in texts if text]
+        if not texts:
+            # self.on_status_change("No speech detected.")
+            return
+        parts = []
+        for text in texts:
+            parts += (b" ", text.encode("utf-8"))
+        _write_parts(self._md_fd, parts)
+        for text in texts:
+            self.on_transcription(text)
+        self.on_status_change("Transcribed.")
+
+    def _trim_silence(self, flat: np.ndarray, samplerate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+        """Drop leading and trailing silence so the model only sees the speech.
+
+        Returns a view of the int16 samples spanning the first to the last
+        voiced frame, plus VAD_PADDING_SECONDS on either side.
+        """
+        frame = int(VAD_FRAME_SECONDS * samplerate)
+        n_frames = flat.size // frame
+        if n_frames == 0:
+            return flat
+
+        frames = flat[:n_frames * frame].reshape(n_frames, frame)
+        energies = np.einsum("ij,ij->i", frames, frames, dtype=np.int64)
+        voiced = energies > _SILENCE_MEAN_SQ_INT16 * frame
+        if not voiced.any():
+            return flat
+
+        first = int(voiced.argmax())
+        last = n_frames - int(voiced[::-1].argmax())
+        pad = int(VAD_PADDING_SECONDS * samplerate)
+        return flat[max(0, first * frame - pad):min(flat.size, last * frame + pad)]
+
+    def _transcribe(self, audio_float: np.ndarray) -> str:
+        """Run the loaded model on a mono float32 chunk and return the text.
+
+        Chunks are decoded independently with greedy, single-temperature
+        decoding: no previous-text prompt and, when a language is set, no
+        language detection pass. faster-whisper's Silero VAD also cuts pauses
+        inside the chunk, which the edge-only silence trim leaves in.
+        """
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(
+                audio_float,
+                beam_size=1,
+                best_of=1,
+                temperature=0.0,
+                vad_filter=True,
+                language=self.language,
+                condition_on_previous_text=False,
+                no_speech_threshold=0.6,
+            )
+            # Segment texts carry their own leading space
+            return "".join(segment.text for segment in segments).strip()
+
+        if self.backend == "openai-whisper" and audio_float.size <= _openai_whisper().audio.N_SAMPLES:
+            return self._decode_window(audio_float)
+
+        # fp16 only on an accelerator; on CPU it just produces warnings. openai-whisper
+        # is greedy by default at temperature 0 (and rejects best_of there).
+        result = self.model.transcribe(
+            audio_float,
+            fp16=self._device != "cpu",
+            language=self.language,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            no_speech_threshold=0.6,
+        )
+        return result["text"].strip()
+
+    def _decode_window(self, audio_float: np.ndarray) -> str:
+        """Decode a chunk of at most 30 s with openai-whisper's low-level API.
+
+        transcribe() computes the log-Mel spectrogram over the chunk plus 30 s
+        of zero padding and predicts segment timestamps. Here only the chunk
+        itself goes through the STFT (its spectrogram is padded to the
+        encoder's fixed 30 s input instead), and the text is decoded without
+        timestamp tokens.
+        """
+        whisper = _openai_whisper()
+        mel = whisper.log_mel_spectrogram(audio_float, self.model.dims.n_mels, device=self.model.device)
+        mel = whisper.pad_or_trim(mel, whisper.audio.N_FRAMES)
+        options = whisper.DecodingOptions(
+            language=self.language,
+            temperature=0.0,
+            without_timestamps=True,
+            fp16=self._device != "cpu",
+        )
+        result = whisper.decode(self.model, mel, options)
+        # transcribe()'s rule for windows without speech
+        if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+            return ""
+        return result.text.strip()
+
+    def _transcribe_words(self, audio_float: np.ndarray, prompt: str) -> list:
+        """Transcribe with word timestamps; returns (start, end, word) tuples in seconds."""
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(
+                audio_float,
+                beam_size=1,
+                best_of=1,
+                temperature=0.0,
+                vad_filter=False,
+                language=self.language,
+                condition_on_previous_text=False,
+                initial_prompt=prompt or None,
+                word_timestamps=True,
+            )
+            return [(w.start, w.end, w.word) for segment in segments for w in segment.words or []]
+
+        result = self.model.transcribe(
+            audio_float,
+            fp16=self._device != "cpu",
+            language=self.language,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            initial_prompt=prompt or None,
+            word_timestamps=True,
+        )
+        return [
+            (w["start"], w["end"], w["word"])
+            for segment in result["segments"]
+            for w in segment.get("words", [])
+        ]
+
     def _ensure_ffmpeg(self) -> None:
-        if shutil.which("ffmpeg") is None:
-            raise RuntimeError("ffmpeg not found in PATH. Whisper requires ffmpeg.")
+        ensure_ffmpeg()
 
     def _check_audio_devices(self) -> None:
-        try:
-            devices = sd.query_devices()
-            if not devices:
-                raise RuntimeError("No audio devices found.")
-            has_input = any(d["max_input_channels"] > 0 for d in devices)
-            if not has_input:
-                raise RuntimeError("No audio input devices (microphones) found.")
-        except Exception as e:
-            raise RuntimeError(f"Error checking audio devices: {e}")
+        check_audio_devices()
+
+
+class _WorkerTranscriber:
+    """The part of a DictationSession a worker process needs to transcribe chunks."""
+
+    _transcribe = DictationSession._transcribe
+    _decode_window = DictationSession._decode_window
+
+    def __init__(self, backend: str, language: Optional[str], model: Any):
+        self.backend = backend
+        self.language = language
+        self._device = "cpu"
+        self.model = model
+
 
+# The system checks need no session state, so they are plain functions that
+# can also be called directly.
+def ensure_ffmpeg() -> None:
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found in PATH. Whisper requires ffmpeg.")
 
-# Backwards compatibility wrappers for direct module usage if needed, 
-# though CLI should use the class now.
-def ensure_ffmpeg():
-    DictationSession(".")._ensure_ffmpeg()
 
-def check_audio_devices():
-    DictationSession(".")._check_audio_devices()
+def check_audio_devices() -> None:
+    global _HAS_INPUT_DEVICE
+    if _HAS_INPUT_DEVICE:
+        return
+    try:
+        devices = _sounddevice().query_devices()
+        if not devices:
+            raise RuntimeError("No audio devices found.")
+        _HAS_INPUT_DEVICE = any(d["max_input_channels"] > 0 for d in devices)
+        if not _HAS_INPUT_DEVICE:
+            raise RuntimeError("No audio input devices (microphones) found.")
+    except Exception as e:
+        raise RuntimeError(f"Error checking audio devices: {e}")
@@ -25,11 +25,14 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, Qt, QObject, pyqtSlot
 from PyQt6.QtGui import QFont, QIcon
 
-from .dictwhisperer import (
-    DictationSession,
+from .constants import (
     DEFAULT_VAULT_PATH,
     DEFAULT_MODEL_SIZE,
     DEFAULT_CHUNK_DURATION,
+    DEFAULT_BACKEND,
+    DEFAULT_DEVICE,
+    BACKENDS,
+    DEVICES,
 )
 
 
@@ -39,6 +42,7 @@ class MainWindow(QMainWindow):
     progress_signal = pyqtSignal(str)
     transcription_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
+    stopped_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -48,6 +52,7 @@ class MainWindow(QMainWindow):
 
         self.session = None
         self.is_recording = False
+        self._starting_session = None  # session whose initialize() is running
 
         # --- UI Setup ---
         central_widget = QWidget()
@@ -103,6 +108,20 @@ class MainWindow(QMainWindow):
         )
         config_layout.addRow("Chunk Duration (s):", self.edt_duration)
 
+        self.cmb_backend = QComboBox()
+        self.cmb_backend.addItems(BACKENDS)
+        self.cmb_backend.setCurrentText(
+            os.environ.get("DICTWHISPERER_BACKEND", DEFAULT_BACKEND)
+        )
+        config_layout.addRow("Backend:", self.cmb_backend)
+
+        self.cmb_device = QComboBox()
+        self.cmb_device.addItems(DEVICES)
+        self.cmb_device.setCurrentText(
+            os.environ.get("DICTWHISPERER_DEVICE", DEFAULT_DEVICE)
+        )
+        config_layout.addRow("Device:", self.cmb_device)
+
         config_group.setLayout(config_layout)
         main_layout.addWidget(config_group)
 
@@ -125,10 +144,11 @@ class MainWindow(QMainWindow):
         self.progress_signal.connect(self.update_progress)
         self.transcription_signal.connect(self.append_transcript)
         self.error_signal.connect(self.show_error)
+        self.stopped_signal.connect(self.reset_ui)
 
     def toggle_recording(self):
-        if self.is_recording:
-            # Stop
+        if self.is_recording or self._starting_session is not None:
+            # Stop (or cancel a model download / load still in progress)
             self.stop_session()
         else:
             # Start
@@ -137,12 +157,17 @@ class MainWindow(QMainWindow):
     def start_session(self):
         vault_path = self.edt_vault_path.text()
         model_size = self.cmb_model_size.currentText()
+        backend = self.cmb_backend.currentText()
+        device = self.cmb_device.currentText()
         try:
             duration = int(self.edt_duration.text())
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Chunk duration must be an integer.")
             return
 
+        # Imported here so the window appears before numpy/PortAudio load
+        from .dictwhisperer import DictationSession
+
         # Disable inputs
         self.enable_inputs(False)
         self.btn_start.setText("Stop Dictation")
@@ -155,6 +180,8 @@ class MainWindow(QMainWindow):
             vault_path=vault_path,
             model_size=model_size,
             chunk_duration=duration,
+            backend=backend,
+            device=device,
             on_status_change=self.status_signal.emit,
             on_progress=self.progress_signal.emit,
             on_transcription=self.transcription_signal.emit,
@@ -171,7 +198,8 @@ class MainWindow(QMainWindow):
             # We will run initialize and start in a background thread to avoid freezing GUI during model load.
             
             import threading
-            t = threading.Thread(target=self._background_start)
+            self._starting_session = self.session
+            t = threading.Thread(target=self._background_start, args=(self.session,))
             t.daemon = True
             t.start()
             
@@ -179,29 +207,62 @@ class MainWindow(QMainWindow):
             self.show_error(str(e))
             self.reset_ui()
 
-    def _background_start(self):
+    def _background_start(self, session):
+        """Initialize and start session. The window may have moved on to a
+        newer session by the time this finishes, so only the session still
+        being started updates the window state."""
+        from .dictwhisperer import Cancelled
+
         try:
             self.status_signal.emit("Initializing & Loading Model...")
-            if self.session:
-                self.session.initialize()
-                self.session.start()
+            session.initialize()
+            if self._starting_session is not session:
+                # Stopped before initialize() began, which clears earlier cancels
+                session.stop()
+            session.start()  # raises Cancelled if stopped in the meantime
+            if self._starting_session is session:
                 self.is_recording = True
+        except Cancelled as e:
+            # stop_session() has already reset the UI
+            self.status_signal.emit(str(e))
         except Exception as e:
-            self.error_signal.emit(str(e))
-            # We can't call self.reset_ui() directly from thread
-            # relying on error_signal connection
+            if self._starting_session is session:
+                self.error_signal.emit(str(e))
+                # We can't call self.reset_ui() directly from thread
+                # relying on error_signal connection
+        finally:
+            if self._starting_session is session:
+                self._starting_session = None
 
     def stop_session(self):
         self.status_signal.emit("Stopping...")
-        if self.session:
-            self.session.stop()
-        
+        # Cleared before stop() so a session still initializing sees it
+        self._starting_session = None
         self.is_recording = False
-        self.reset_ui()
+        if not self.session:
+            self.reset_ui()
+            return
+
+        # stop() waits for the queued audio to be transcribed, so run it off
+        # the GUI thread and reset the UI once it returns
+        import threading
+        self.btn_start.setEnabled(False)
+        t = threading.Thread(target=self._background_stop, args=(self.session,))
+        t.daemon = True
+        t.start()
+
+    def _background_stop(self, session):
+        try:
+            session.stop()
+        except Exception as e:
+            self.error_signal.emit(str(e))
+        finally:
+            self.stopped_signal.emit()
 
     def reset_ui(self):
         self.enable_inputs(True)
         self.btn_start.setText("Start Dictation")
+        self.btn_start.setEnabled(True)
         self.progress_bar.setValue(0)
         self.is_recording = False
 
@@ -209,6 +270,8 @@ class MainWindow(QMainWindow):
         self.edt_vault_path.setEnabled(enabled)
         self.cmb_model_size.setEnabled(enabled)
         self.edt_duration.setEnabled(enabled)
+        self.cmb_backend.setEnabled(enabled)
+        self.cmb_device.setEnabled(enabled)
 
     @pyqtSlot(str)
     def update_status(self, msg: str):
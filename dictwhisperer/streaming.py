@@ -0,0 +1,82 @@
+"""
+LocalAgreement-2 commit policy for streaming transcription.
+
+In streaming mode a rolling audio buffer is re-transcribed after every
+recording step. Words are only written out once two consecutive
+transcriptions agree on them, which filters out the unstable guesses
+Whisper makes at the end of an utterance that is still being spoken.
+Follows the Whisper-Streaming approach (Machacek et al., 2023).
+"""
+
+from typing import List, Tuple
+
+# (start, end, text) with times in seconds since the session started
+Word = Tuple[float, float, str]
+
+
+class HypothesisBuffer:
+    """
+    Tracks the uncommitted tail of the transcript and commits the words two
+    consecutive hypotheses agree on.
+    """
+
+    def __init__(self):
+        self.committed: List[Word] = []  # committed words still inside the audio buffer
+        self.last_committed_time = 0.0
+        self.buffer: List[Word] = []  # previous hypothesis, not yet committed
+        self.new: List[Word] = []
+
+    def insert(self, words: List[Word], offset: float) -> None:
+        """
+        Add a new hypothesis.
+
+        Args:
+            words: (start, end, text) tuples relative to the audio buffer.
+            offset: Session time in seconds at which the audio buffer starts.
+        """
+        new = [(start + offset, end + offset, text.strip()) for start, end, text in words]
+        self.new = [word for word in new if word[0] > self.last_committed_time - 0.1]
+
+        # Whisper often repeats the last committed words at the start of the
+        # buffer; drop an overlap of up to five words.
+        if self.new and self.committed and abs(self.new[0][0] - self.last_committed_time) < 1:
+            for n in range(min(len(self.committed), len(self.new), 5), 0, -1):
+                tail = [word[2] for word in self.committed[-n:]]
+                head = [word[2] for word in self.new[:n]]
+                if tail == head:
+                    del self.new[:n]
+                    break
+
+    def flush(self) -> List[Word]:
+        """Commit and return the longest common prefix of the last two hypotheses."""
+        commit = []
+        while self.new and self.buffer and self.new[0][2] == self.buffer[0][2]:
+            word = self.new.pop(0)
+            self.buffer.pop(0)
+            commit.append(word)
+            self.last_committed_time = word[1]
+        self.buffer = self.new
+        self.new = []
+        self.committed.extend(commit)
+        return commit
+
+    def commit_before(self, time: float) -> List[Word]:
+        """Commit uncommitted words that end before time, e.g. audio about to be dropped."""
+        commit = []
+        while self.buffer and self.buffer[0][1] <= time:
+            word = self.buffer.pop(0)
+            commit.append(word)
+            self.last_committed_time = word[1]
+        self.committed.extend(commit)
+        return commit
+
+    def pop_committed(self, time: float) -> List[Word]:
+        """Forget and return committed words that end before time (their audio was trimmed)."""
+        popped = []
+        while self.committed and self.committed[0][1] <= time:
+            popped.append(self.committed.pop(0))
+        return popped
+
+    def complete(self) -> List[Word]:
+        """Return the current uncommitted hypothesis."""
+        return self.buffer
@@ -15,11 +15,16 @@ setup(
         ],
     },
     install_requires=[
-        "openai-whisper",
+        "faster-whisper",
         "sounddevice",
         "numpy",
         "PyQt6",
     ],
+    extras_require={
+        "openai-whisper": ["openai-whisper"],
+        "openvino": ["optimum-intel[openvino]"],
+        "vad": ["webrtcvad"],
+    },
     author="80nF1R3H34D",
     author_email="",  # Update if you have a public email
     description="Real-time voice dictation to Obsidian using OpenAI Whisper.",
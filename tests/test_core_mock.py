@@ -5,12 +5,17 @@ import threading
 import time
 import os
 import shutil
+import io
+import urllib.error
+from pathlib import Path
 import numpy as np
 
 # Mock dependencies before importing the module
 sys_modules_patch = patch.dict('sys.modules', {
     'sounddevice': MagicMock(),
     'whisper': MagicMock(),
+    'faster_whisper': MagicMock(),
+    'faster_whisper.vad': MagicMock(),
 })
 sys_modules_patch.start()
 
@@ -39,7 +44,6 @@ class TestDictationSession(unittest.TestCase):
 
     def tearDown(self):
         shutil.rmtree(self.mock_vault, ignore_errors=True)
-        sys_modules_patch.stop()
 
     def test_initialize(self):
         self.session.initialize()
@@ -47,28 +51,357 @@ class TestDictationSession(unittest.TestCase):
         self.session.on_status_change.assert_any_call("Ready.")
         self.assertTrue(os.path.exists(self.session.md_filename))
 
+    def test_callbacks_keep_their_positions(self):
+        callbacks = [MagicMock() for _ in range(4)]
+        session = DictationSession(self.mock_vault, "tiny", 1, *callbacks)
+        self.assertEqual(
+            [session.on_status_change, session.on_progress, session.on_transcription, session.on_error],
+            callbacks,
+        )
+        with self.assertRaises(TypeError):
+            DictationSession(self.mock_vault, "tiny", 1, *callbacks, "openvino")
+
     @patch('dictwhisperer.dictwhisperer.sd')
     def test_record_loop(self, mock_sd):
+        self.session.vad_aggressiveness = None  # fixed-length chunks
+        self.session._transcribe = MagicMock(return_value="hello")
         self.session.initialize()
-        
-        # Setup mock recording
-        mock_sd.rec.return_value = np.zeros(16000, dtype='int16') # 1 sec silence
-        mock_sd.get_status().active = False # Finish immediately
-        
+
         # Start in thread
         self.session.start()
-        time.sleep(0.5)
         self.assertTrue(self.session.is_running)
-        
+        mock_sd.RawInputStream.assert_called_once()
+        stream = mock_sd.RawInputStream.return_value
+        stream.start.assert_called_once()
+
+        # Deliver one 1 second chunk through the stream callback
+        callback = mock_sd.RawInputStream.call_args.kwargs["callback"]
+        callback(np.full(16000, 3000, dtype='int16').tobytes(), 16000, None, None)
+
         # Stop
         self.session.stop()
         self.assertFalse(self.session.is_running)
-        
-        # Check callbacks
-        # Since we mocked silence, it might not transcribe, depending on threshold.
-        # But start/stop status should be logged.
+        stream.stop.assert_called_once()
+        stream.close.assert_called_once()
+
+        self.session.on_transcription.assert_called_once_with("hello")
         self.session.on_status_change.assert_any_call("Dictation started.")
         self.session.on_status_change.assert_any_call("Dictation stopped.")
 
+    @patch('dictwhisperer.dictwhisperer.sd')
+    def test_audio_callback_queues_full_chunks(self, mock_sd):
+        self.session.vad_aggressiveness = None  # fixed-length chunks
+        self.session._open_stream()
+
+        # 1 second chunks; deliver a little more than one chunk in one block
+        block = np.ones(16000 + 100, dtype='int16').tobytes()
+        self.session._audio_callback(block, 16000 + 100, None, None)
+
+        chunk = np.frombuffer(self.session._audio_queue.get_nowait(), dtype='int16')
+        self.assertEqual(chunk.size, 16000)
+        self.assertTrue((chunk == 1).all())
+        self.assertEqual(self.session._cursor, 100)
+        self.assertEqual(self.session._dropped_chunks, 0)
+        self.session.on_progress.assert_called_with("Recording: 1s")
+
+    @patch('dictwhisperer.dictwhisperer._webrtcvad', return_value=None)
+    @patch('dictwhisperer.dictwhisperer.sd')
+    def test_vad_segmentation_ends_chunk_at_pause(self, mock_sd, mock_vad):
+        self.session.max_chunk_duration = 5
+        self.session._open_stream()
+
+        # 1 s of silence, 0.5 s of speech, then 1 s of silence
+        audio = np.zeros(16000 * 5 // 2, dtype='int16')
+        audio[16000:24000] = 3000
+        for start in range(0, audio.size, 1024):
+            block = audio[start:start + 1024]
+            self.session._audio_callback(block.tobytes(), block.size, None, None)
+
+        chunk = np.frombuffer(self.session._audio_queue.get_nowait(), dtype='int16')
+        self.assertTrue(self.session._audio_queue.empty())
+        # Pre-roll, the speech and the pause that ended it, but not the
+        # silence before the pre-roll
+        self.assertEqual(int((chunk == 3000).sum()), 8000)
+        self.assertLessEqual(chunk.size, 3200 + 8000 + 6400 + 1024)
+        self.assertFalse(self.session._speaking)
+        self.session.on_progress.assert_called_with("Listening...")
+
+        # Trailing silence is not queued on stop
+        self.session._queue_partial_chunk()
+        self.assertTrue(self.session._audio_queue.empty())
+
+    def test_silent_chunk_is_not_transcribed(self):
+        self.session.initialize()
+        self.session._transcribe = MagicMock(return_value="hello")
+
+        self.session._transcribe_and_append(np.zeros((16000, 1), dtype='int16'))
+        self.session._transcribe.assert_not_called()
+
+        loud = np.full((16000, 1), 3000, dtype='int16')
+        self.session._transcribe_and_append(loud)
+        self.session._transcribe.assert_called_once()
+        self.session.on_transcription.assert_called_once_with("hello")
+
+    def test_trim_silence_keeps_padded_speech(self):
+        audio = np.zeros(16000 * 3, dtype=np.int16)
+        audio[16000:24000] = 16384  # 0.5 s of "speech" starting at 1 s
+
+        trimmed = self.session._trim_silence(audio)
+        # 200 ms of padding on either side of the voiced frames
+        self.assertEqual(trimmed.size, 8000 + 2 * 3200)
+        self.assertTrue(np.shares_memory(trimmed, audio))
+
+    def test_batch_appends_in_recording_order(self):
+        self.session.initialize()
+        self.session.backend = "faster-whisper"
+        self.session._device = "cuda"  # chunks run in parallel threads on GPU
+
+        def fake_transcribe(audio_float):
+            # Values tag the chunk; delay the first one so threads finish out of order
+            tag = int(round(audio_float[0] * 32768))
+            if tag == 1000:
+                time.sleep(0.1)
+            return {1000: "first", 2000: "second", 3000: "third"}[tag]
+
+        self.session._transcribe = fake_transcribe
+        batch = [np.full((16000, 1), v, dtype='int16') for v in (1000, 2000, 3000)]
+        self.session._transcribe_batch(batch)
+
+        with open(self.session.md_filename, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith(" first second third"))
+
+    def test_openvino_splits_audio_into_30_second_windows(self):
+        from dictwhisperer.dictwhisperer import _OpenVINOWhisper
+        model = _OpenVINOWhisper.__new__(_OpenVINOWhisper)
+        model.processor = MagicMock()
+        model.model = MagicMock()
+        model.processor.batch_decode.return_value = [" first", " second"]
+
+        result = model.transcribe(np.zeros(16000 * 45, dtype=np.float32))
+
+        windows = model.processor.call_args[0][0]
+        self.assertEqual([w.size for w in windows], [16000 * 30, 16000 * 15])
+        self.assertEqual(result["text"], "first second")
+
+    def test_broken_worker_pool_falls_back_to_serial(self):
+        from concurrent.futures.process import BrokenProcessPool
+        self.session.initialize()
+        self.session.backend = "openai-whisper"
+        pool = MagicMock()
+        pool.map.side_effect = BrokenProcessPool("worker died")
+        self.session._pool = pool
+        self.session._transcribe = MagicMock(side_effect=["first", "second"])
+
+        batch = [np.full((16000, 1), 3000, dtype='int16') for _ in range(2)]
+        self.session._transcribe_batch(batch)
+
+        self.assertIsNone(self.session._pool)
+        pool.shutdown.assert_called_once()
+        self.session.on_error.assert_not_called()
+        with open(self.session.md_filename, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith(" first second"))
+
+    def test_parallel_is_not_used_when_streaming(self):
+        self.session.backend = "openvino"
+        self.session.streaming = True
+        self.assertIsNone(self.session._start_pool())
+        self.session.on_status_change.assert_called_once_with(
+            "Parallel transcription not used: streaming has no backlog of chunks."
+        )
+
+    @patch('dictwhisperer.dictwhisperer.sd')
+    def test_stop_transcribes_partial_chunk(self, mock_sd):
+        self.session.initialize()
+        self.session._transcribe_and_append = MagicMock()
+        self.session.start()
+
+        half_second = np.full(8000, 3000, dtype='int16').tobytes()
+        self.session._audio_callback(half_second, 8000, None, None)
+        self.session.stop()
+
+        self.session._transcribe_and_append.assert_called_once()
+        audio = self.session._transcribe_and_append.call_args[0][0]
+        self.assertEqual(audio.size, 8000)
+
+    @patch('dictwhisperer.dictwhisperer.sd')
+    def test_stop_waits_to_queue_partial_chunk_when_queue_is_full(self, mock_sd):
+        self.session.vad_aggressiveness = None  # fixed-length chunks
+        self.session.initialize()
+        release = threading.Event()
+        sizes = []
+
+        def slow_transcribe(audio_float):
+            sizes.append(audio_float.size)
+            release.wait()
+            return "text"
+
+        self.session._transcribe = slow_transcribe
+        self.session.start()
+
+        second = np.full(16000, 3000, dtype='int16').tobytes()
+        self.session._audio_callback(second, 16000, None, None)
+        time.sleep(0.2)  # the loop is now stuck transcribing the first chunk
+        for _ in range(2):
+            self.session._audio_callback(second, 16000, None, None)
+        self.assertTrue(self.session._audio_queue.full())
+        self.session._audio_callback(second[:16000], 8000, None, None)
+
+        threading.Timer(0.3, release.set).start()
+        self.session.stop()
+
+        self.assertEqual(sizes, [16000, 16000, 16000, 8000])
+        self.assertEqual(self.session._dropped_chunks, 0)
+
+    def test_loop_error_marks_session_failed(self):
+        self.session._audio_queue = MagicMock()
+        self.session._audio_queue.get.side_effect = RuntimeError("boom")
+
+        self.session._run_loop()
+        self.assertTrue(self.session.failed)
+        self.session.on_error.assert_called_once_with("Error in dictation loop: boom")
+
+    @patch('dictwhisperer.dictwhisperer.sd')
+    def test_stop_between_initialize_and_start_cancels(self, mock_sd):
+        from dictwhisperer.dictwhisperer import Cancelled
+        self.session.initialize()
+        self.session.stop()
+
+        with self.assertRaises(Cancelled):
+            self.session.start()
+        self.assertFalse(self.session.is_running)
+        mock_sd.RawInputStream.assert_not_called()
+        self.assertIsNone(self.session._md_fd)
+
+    @patch('urllib.request.urlopen')
+    def test_stop_cancels_download_between_blocks(self, mock_urlopen):
+        from dictwhisperer.dictwhisperer import Cancelled, DOWNLOAD_BLOCK_SIZE
+
+        def readinto(block):
+            # stop() arrives while the first block is being received
+            self.session.stop()
+            block[:] = b"x" * len(block)
+            return len(block)
+
+        response = mock_urlopen.return_value
+        response.__enter__.return_value = response
+        response.status = 200
+        response.headers = {"Content-Length": str(4 * DOWNLOAD_BLOCK_SIZE)}
+        response.readinto.side_effect = readinto
+
+        part_path = Path(self.mock_vault) / "model.pt.part"
+        with self.assertRaises(Cancelled):
+            self.session._download("https://example.com/model.pt", part_path)
+        # The block in flight is kept for a later resume; nothing after it is read
+        self.assertEqual(response.readinto.call_count, 1)
+        self.assertEqual(part_path.stat().st_size, DOWNLOAD_BLOCK_SIZE)
+
+    @patch('dictwhisperer.dictwhisperer._pick_device', return_value="cuda")
+    @patch('dictwhisperer.dictwhisperer._faster_whisper_model')
+    def test_auto_device_falls_back_to_cpu_when_warm_up_fails(self, mock_loader, mock_pick):
+        from dictwhisperer.dictwhisperer import _get_model
+        _get_model.cache_clear()
+        self.addCleanup(_get_model.cache_clear)
+        models = {"cuda": MagicMock(), "cpu": MagicMock()}
+        # Missing CUDA libraries only show up once the model runs
+        models["cuda"].transcribe.side_effect = RuntimeError("libcublas.so.12 not found")
+        models["cpu"].transcribe.return_value = ([], None)
+        mock_loader.return_value.side_effect = lambda size, device, **kwargs: models[device]
+
+        session = DictationSession(self.mock_vault, model_size="tiny", on_status_change=MagicMock())
+        model = session._load_whisper_model("tiny")
+
+        self.assertIs(model, models["cpu"])
+        self.assertEqual(session._device, "cpu")
+        session.on_status_change.assert_any_call(
+            "Could not run model on cuda (libcublas.so.12 not found); falling back to CPU."
+        )
+        # The broken CUDA model is not reused by later sessions
+        self.assertEqual(_get_model.cache_info().currsize, 1)
+
+    def _fake_response(self, mock_urlopen, status, data):
+        stream = io.BytesIO(data)
+        response = mock_urlopen.return_value
+        response.__enter__.return_value = response
+        response.status = status
+        response.headers = {"Content-Length": str(len(data))}
+        response.readinto.side_effect = stream.readinto
+
+    @patch('urllib.request.urlopen')
+    def test_download_resumes_partial_file(self, mock_urlopen):
+        self._fake_response(mock_urlopen, 206, b"def")
+        part_path = Path(self.mock_vault) / "model.pt.part"
+        part_path.write_bytes(b"abc")
+
+        self.session._download("https://example.com/model.pt", part_path)
+
+        request = mock_urlopen.call_args[0][0]
+        self.assertEqual(request.get_header("Range"), "bytes=3-")
+        self.assertEqual(part_path.read_bytes(), b"abcdef")
+        self.session.on_progress.assert_called_with("Downloading: 100.0%")
+
+    @patch('urllib.request.urlopen')
+    def test_download_restarts_when_range_is_ignored(self, mock_urlopen):
+        self._fake_response(mock_urlopen, 200, b"abcdef")
+        part_path = Path(self.mock_vault) / "model.pt.part"
+        part_path.write_bytes(b"stale")
+
+        self.session._download("https://example.com/model.pt", part_path)
+        self.assertEqual(part_path.read_bytes(), b"abcdef")
+
+    @patch('urllib.request.urlopen')
+    def test_download_of_complete_part_file_is_a_no_op(self, mock_urlopen):
+        mock_urlopen.side_effect = urllib.error.HTTPError(
+            "https://example.com/model.pt", 416, "Range Not Satisfiable", {}, None
+        )
+        part_path = Path(self.mock_vault) / "model.pt.part"
+        part_path.write_bytes(b"abcdef")
+
+        self.session._download("https://example.com/model.pt", part_path)
+        self.assertEqual(part_path.read_bytes(), b"abcdef")
+
+    @patch('dictwhisperer.dictwhisperer._openai_checkpoint')
+    def test_download_with_wrong_checksum_is_discarded(self, mock_checkpoint):
+        target_path = Path(self.mock_vault) / "model.pt"
+        url = "https://example.com/" + "0" * 64 + "/model.pt"
+        mock_checkpoint.return_value = (url, "0" * 64, target_path)
+        self.session._download = lambda url, part_path: part_path.write_bytes(b"corrupt")
+
+        # Falls back to whisper's own download instead of raising
+        self.session._ensure_model_downloaded()
+        self.assertFalse(target_path.exists())
+        self.assertFalse((Path(self.mock_vault) / "model.pt.part").exists())
+
+    @patch('dictwhisperer.dictwhisperer._openai_checkpoint')
+    def test_part_file_is_removed_after_fallback_download(self, mock_checkpoint):
+        target_path = Path(self.mock_vault) / "model.pt"
+        mock_checkpoint.return_value = ("https://example.com/model.pt", "0" * 64, target_path)
+        part_path = Path(self.mock_vault) / "model.pt.part"
+        part_path.write_bytes(b"abc")
+
+        self.session._remove_stale_download()
+        self.assertTrue(part_path.exists())  # still needed to resume
+
+        target_path.write_bytes(b"abcdef")
+        self.session._remove_stale_download()
+        self.assertFalse(part_path.exists())
+
+    @patch('dictwhisperer.dictwhisperer._faster_whisper_model')
+    def test_model_is_reused_across_sessions(self, mock_loader):
+        from dictwhisperer.dictwhisperer import _get_model
+        _get_model.cache_clear()
+        self.addCleanup(_get_model.cache_clear)
+        mock_loader.return_value.return_value.transcribe.return_value = ([], None)
+
+        sessions = [DictationSession(self.mock_vault, model_size="tiny", device="cpu") for _ in range(2)]
+        models = [session._load_whisper_model("tiny") for session in sessions]
+
+        self.assertIs(models[0], models[1])
+        mock_loader.return_value.assert_called_once()
+        # Only the first load is warmed up
+        models[0].transcribe.assert_called_once()
+
+def tearDownModule():
+    sys_modules_patch.stop()
+
 if __name__ == '__main__':
     unittest.main()
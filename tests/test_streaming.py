@@ -0,0 +1,40 @@
+import unittest
+
+from dictwhisperer.streaming import HypothesisBuffer
+
+
+class TestHypothesisBuffer(unittest.TestCase):
+    def test_commits_words_two_passes_agree_on(self):
+        hyp = HypothesisBuffer()
+
+        hyp.insert([(0.0, 0.5, " hello"), (0.5, 1.0, " word")], offset=0.0)
+        self.assertEqual(hyp.flush(), [])
+
+        hyp.insert([(0.0, 0.5, " hello"), (0.5, 1.0, " world"), (1.0, 1.5, " again")], offset=0.0)
+        committed = hyp.flush()
+        self.assertEqual([w[2] for w in committed], ["hello"])
+        self.assertEqual(hyp.last_committed_time, 0.5)
+        self.assertEqual([w[2] for w in hyp.complete()], ["world", "again"])
+
+    def test_drops_repeated_committed_words_after_trim(self):
+        hyp = HypothesisBuffer()
+        hyp.insert([(0.0, 0.5, " one"), (0.5, 1.0, " two")], offset=0.0)
+        hyp.flush()
+        hyp.insert([(0.0, 0.5, " one"), (0.5, 1.0, " two")], offset=0.0)
+        self.assertEqual(len(hyp.flush()), 2)
+
+        # The window now starts at 0.95 s and Whisper repeats "two"
+        hyp.insert([(0.0, 0.1, " two"), (0.2, 0.6, " three")], offset=0.95)
+        self.assertEqual([w[2] for w in hyp.new], ["three"])
+
+    def test_commit_before_flushes_words_about_to_be_dropped(self):
+        hyp = HypothesisBuffer()
+        hyp.insert([(0.0, 0.5, " a"), (2.0, 2.5, " b")], offset=0.0)
+        hyp.flush()
+
+        self.assertEqual([w[2] for w in hyp.commit_before(1.0)], ["a"])
+        self.assertEqual([w[2] for w in hyp.pop_committed(1.0)], ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()